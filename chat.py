@@ -4,13 +4,19 @@ Simple terminal chat with Beatrice - WITH STREAMING, TOOLS & PERSISTENT MEMORY
 Run: python chat.py [model_name]
 Examples:
   python chat.py                    # Uses default (gemma2:9b)
+  BEATRICE_FAST_MODEL=qwen2.5:0.5b python chat.py   # Route simple turns to a small model
 """
-import urllib.request
+import asyncio
+import contextlib
 import json
+import signal
 import sys
 import os
-import time
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 
 # Add project root to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -18,6 +24,7 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from src.brain.prompts import SYSTEM_PROMPT
 from src.tools.registry import ToolRegistry
 from src.memory.simple_memory import SimpleMemory
+from src.brain.router import LatencyTracker, ModelRouter, log_route
 
 OLLAMA_URL = "http://localhost:11434"
 
@@ -25,11 +32,18 @@ OLLAMA_URL = "http://localhost:11434"
 DEFAULT_MODEL = "qwen2.5:3b"
 MODEL = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("BEATRICE_MODEL", DEFAULT_MODEL)
 
+# Optional small model for simple turns; MODEL handles the rest
+FAST_MODEL = os.environ.get("BEATRICE_FAST_MODEL")
+
 # Initialize shared components
 tool_registry = ToolRegistry()
 memory = SimpleMemory()
+router = ModelRouter(MODEL, FAST_MODEL)
+latency = LatencyTracker()
 
 print(f"\033[92m✓ Model: {MODEL}\033[0m")
+if router.enabled:
+    print(f"\033[92m✓ Fast model: {FAST_MODEL} (routing on)\033[0m")
 print(f"\033[92m✓ Memory: {len(memory.memories)} memories\033[0m")
 
 
@@ -37,31 +51,89 @@ class ThinkingIndicator:
     """Shows a thinking animation while waiting for response."""
     
     def __init__(self):
-        self.running = False
-        self.thread = None
+        self.task = None
         self.frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
     
     def start(self, message="Thinking"):
-        self.running = True
-        self.thread = threading.Thread(target=self._animate, args=(message,))
-        self.thread.start()
+        self.task = asyncio.create_task(self._animate(message))
     
-    def _animate(self, message):
+    async def _animate(self, message):
         idx = 0
-        while self.running:
+        while True:
             frame = self.frames[idx % len(self.frames)]
             print(f"\r\033[95m{frame} {message}...\033[0m", end="", flush=True)
-            time.sleep(0.1)
+            await asyncio.sleep(0.1)
             idx += 1
     
     def stop(self):
-        self.running = False
-        if self.thread:
-            self.thread.join()
+        if self.task is None:
+            return
+        self.task.cancel()
+        self.task = None
         # Clear the thinking line
         print("\r" + " " * 40 + "\r", end="", flush=True)
 
 
+class BackgroundWriter:
+    """Runs disk writes off the event loop, one at a time, in submission order."""
+    
+    def __init__(self, memory: SimpleMemory):
+        self.memory = memory
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self.pending = set()
+    
+    def remember(self, speaker: str, text: str):
+        """Record a snippet now (so the next prompt sees it) and flush it later."""
+        self.memory.add(speaker, text)
+        self.submit(self.memory.flush)
+    
+    def forget(self):
+        """Clear memory now and write the empty file later."""
+        self.memory.reset()
+        self.submit(self.memory.flush)
+    
+    def submit(self, func, *args):
+        """Queue func(*args) to run on the writer thread."""
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, func, *args)
+        self.pending.add(future)
+        future.add_done_callback(self.pending.discard)
+    
+    async def drain(self):
+        """Wait for all queued writes to reach disk."""
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+
+async def read_input(prompt: str) -> str:
+    """Read a line from stdin without blocking the event loop.
+    
+    Uses a daemon thread rather than the default executor so a pending
+    input() never keeps the process alive after the user quits.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def _resolve(result, error):
+        # Runs on the loop thread; the future may already be cancelled by Ctrl-C
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def _reader():
+        try:
+            loop.call_soon_threadsafe(_resolve, input(prompt), None)
+        except BaseException as e:
+            loop.call_soon_threadsafe(_resolve, None, e)
+    
+    threading.Thread(target=_reader, daemon=True).start()
+    return await future
+
+
 def build_system_prompt_with_memories() -> str:
     """Enhance system prompt with user facts from memory."""
     user_facts = memory.get_user_facts()
@@ -76,8 +148,30 @@ def build_system_prompt_with_memories() -> str:
     return SYSTEM_PROMPT
 
 
-def stream_chat(user_input: str, history: list):
-    """Chat with streaming response - yields chunks as they arrive."""
+async def _stream_lines(client: httpx.AsyncClient, request_data: dict):
+    """POST to Ollama's chat endpoint and yield each decoded JSON chunk."""
+    async with client.stream("POST", f"{OLLAMA_URL}/api/chat", json=request_data) as response:
+        # httpx doesn't raise on error statuses the way urlopen did
+        if response.status_code != 200:
+            await response.aread()
+            raise RuntimeError(f"HTTP Error {response.status_code}: {response.text}")
+        async for line in response.aiter_lines():
+            if line:
+                chunk = json.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+                yield chunk
+                if chunk.get("done", False):
+                    break
+
+
+async def stream_chat(client: httpx.AsyncClient, model: str, user_input: str, history: list):
+    """Chat with streaming response - yields chunks as they arrive.
+    
+    Cancelling the consuming task closes the HTTP stream, which aborts the
+    generation on the Ollama side. Request and model errors propagate to the
+    caller.
+    """
     # Build prompt with memories
     enhanced_prompt = build_system_prompt_with_memories()
     
@@ -90,157 +184,212 @@ def stream_chat(user_input: str, history: list):
     # Tools disabled by default (3B model uses them incorrectly)
     # Set BEATRICE_TOOLS=1 to enable
     request_data = {
-        "model": MODEL,
+        "model": model,
         "messages": messages,
         "stream": True
     }
     
     # Only add tools if explicitly enabled AND model supports them
     if os.environ.get("BEATRICE_TOOLS") == "1":
-        if "qwen" in MODEL.lower() or "mistral" in MODEL.lower():
+        if "qwen" in model.lower() or "mistral" in model.lower():
             request_data["tools"] = tool_registry.get_ollama_tools()
     
-    data = json.dumps(request_data).encode('utf-8')
-    
-    req = urllib.request.Request(
-        f"{OLLAMA_URL}/api/chat",
-        data=data,
-        headers={'Content-Type': 'application/json'}
-    )
-    
     # First pass: collect response and check for tool calls
     # We buffer everything first to know if tools are involved
     initial_response = ""
     tool_calls = []
     
-    try:
-        with urllib.request.urlopen(req, timeout=120) as response:
-            for line in response:
-                if line:
-                    chunk = json.loads(line.decode('utf-8'))
-                    message = chunk.get("message", {})
-                    
-                    # Check for tool calls
-                    if "tool_calls" in message and message["tool_calls"]:
-                        tool_calls.extend(message["tool_calls"])
-                    
-                    # Buffer content (don't yield yet - we might have tool calls)
-                    content = message.get("content", "")
-                    if content:
-                        initial_response += content
-                    
-                    if chunk.get("done", False):
-                        break
-        
-        # If NO tool calls, stream the initial response
-        if not tool_calls:
-            yield initial_response
-            return
-        
-        # If tool calls exist, execute them and get final response
-        tool_results = []
-        for tool_call in tool_calls:
-            tool_name = tool_call["function"]["name"]
-            arguments = tool_call["function"].get("arguments", {})
-            if isinstance(arguments, str):
-                arguments = json.loads(arguments)
-            
-            tool_result = tool_registry.call_tool(tool_name, **arguments)
-            tool_results.append(f"{tool_result}")
+    async for chunk in _stream_lines(client, request_data):
+        message = chunk.get("message", {})
         
-        # Send tool results back to get final response
-        messages.append({"role": "assistant", "content": initial_response, "tool_calls": tool_calls})
-        messages.append({"role": "tool", "content": "\n".join(tool_results)})
+        # Check for tool calls
+        if "tool_calls" in message and message["tool_calls"]:
+            tool_calls.extend(message["tool_calls"])
         
-        data = json.dumps({
-            "model": MODEL,
-            "messages": messages,
-            "stream": True
-        }).encode('utf-8')
-        
-        req = urllib.request.Request(
-            f"{OLLAMA_URL}/api/chat",
-            data=data,
-            headers={'Content-Type': 'application/json'}
-        )
+        # Buffer content (don't yield yet - we might have tool calls)
+        content = message.get("content", "")
+        if content:
+            initial_response += content
+    
+    # If NO tool calls, stream the initial response
+    if not tool_calls:
+        yield initial_response
+        return
+    
+    # If tool calls exist, execute them and get final response
+    tool_results = []
+    for tool_call in tool_calls:
+        tool_name = tool_call["function"]["name"]
+        arguments = tool_call["function"].get("arguments", {})
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments)
         
-        # Stream the FINAL response (this is the only one user sees)
-        with urllib.request.urlopen(req, timeout=120) as response:
-            for line in response:
-                if line:
-                    chunk = json.loads(line.decode('utf-8'))
-                    content = chunk.get("message", {}).get("content", "")
-                    if content:
-                        yield content
-                    if chunk.get("done", False):
-                        break
+        # Tools may shell out or hit the filesystem; keep the loop responsive
+        tool_result = await asyncio.to_thread(tool_registry.call_tool, tool_name, **arguments)
+        tool_results.append(f"{tool_result}")
+    
+    # Send tool results back to get final response
+    messages.append({"role": "assistant", "content": initial_response, "tool_calls": tool_calls})
+    messages.append({"role": "tool", "content": "\n".join(tool_results)})
+    
+    # Stream the FINAL response (this is the only one user sees)
+    async for chunk in _stream_lines(client, {
+        "model": model,
+        "messages": messages,
+        "stream": True
+    }):
+        content = chunk.get("message", {}).get("content", "")
+        if content:
+            yield content
+
+
+async def generate_reply(client: httpx.AsyncClient, model: str, user_input: str, history: list):
+    """Stream one reply to the terminal.
+    
+    Returns the reply text and (first output, total) latencies in seconds.
+    First output is when text first reaches the screen; replies are buffered
+    to detect tool calls, so it is not time-to-first-token. On error the text
+    is "" and the latencies are None. Re-raises CancelledError if the user
+    interrupted the reply.
+    """
+    thinking = ThinkingIndicator()
+    thinking.start("Gathering thoughts")
     
+    full_response = ""
+    first_chunk = True
+    started = time.perf_counter()
+    first_output_at = None
+    timings = None
+    
+    try:
+        async with contextlib.aclosing(stream_chat(client, model, user_input, history)) as chunks:
+            async for chunk in chunks:
+                if first_chunk:
+                    first_output_at = time.perf_counter() - started
+                    thinking.stop()
+                    print("\033[95mBeatrice:\033[0m ", end="", flush=True)
+                    first_chunk = False
+                
+                print(chunk, end="", flush=True)
+                if not chunk.startswith("\n\n\033[90m"):
+                    full_response += chunk
+        # Empty replies would pull the medians down, so they get no timings
+        if full_response:
+            timings = (first_output_at, time.perf_counter() - started)
     except Exception as e:
-        yield f"Error: {str(e)}"
+        if first_chunk:
+            thinking.stop()
+            print("\033[95mBeatrice:\033[0m ", end="", flush=True)
+        print(f"Error: {str(e)}", end="", flush=True)
+        full_response = ""
+    finally:
+        thinking.stop()
+    
+    print("\n")
+    return full_response, timings
 
 
-def main():
+def _install_sigint_handler(loop, handler) -> bool:
+    """Route Ctrl-C to `handler` instead of raising KeyboardInterrupt."""
+    try:
+        loop.add_signal_handler(signal.SIGINT, handler)
+        return True
+    except (NotImplementedError, RuntimeError):
+        # Not supported on Windows event loops. There asyncio.run turns Ctrl-C
+        # into cancelling main() itself, which main() lets end the session.
+        return False
+
+
+async def main():
     print("\n" + "="*50)
     print("  Beatrice AI - Terminal Chat")
     print("  Commands: 'quit', 'clear' (reset memory)")
+    print("  Ctrl-C stops a reply; at the prompt it exits")
     print("="*50 + "\n")
     
     history = []
-    thinking = ThinkingIndicator()
+    writer = BackgroundWriter(memory)
+    loop = asyncio.get_running_loop()
     
-    while True:
+    # Whatever is currently awaited: the input read or the reply generation.
+    # Ctrl-C cancels it, which either ends the session or just stops the reply.
+    current = {"task": None}
+    
+    def on_sigint():
+        task = current["task"]
+        if task is not None and not task.done():
+            task.cancel()
+    
+    has_handler = _install_sigint_handler(loop, on_sigint)
+    
+    async with httpx.AsyncClient(timeout=120.0) as client:
         try:
-            user_input = input("\033[94mYou:\033[0m ")
-        except (KeyboardInterrupt, EOFError):
-            print("\n\n\033[95mBeatrice:\033[0m Leaving so soon? How typical, I suppose...")
-            break
-            
-        if user_input.lower() in ['quit', 'exit', 'bye']:
-            print("\n\033[95mBeatrice:\033[0m Fine, leave then. Not that I care, I suppose...")
-            break
-        
-        if user_input.lower() == 'clear':
-            memory.clear()
-            history = []
-            print("\033[93m✓ Memory cleared\033[0m\n")
-            continue
-        
-        if not user_input.strip():
-            continue
-        
-        # Save user input to memory immediately
-        memory.store("User", user_input)
-        
-        # Show thinking indicator
-        thinking.start("Gathering thoughts")
-        
-        # Start streaming
-        full_response = ""
-        first_chunk = True
-        
-        for chunk in stream_chat(user_input, history):
-            if first_chunk:
-                thinking.stop()
-                print("\033[95mBeatrice:\033[0m ", end="", flush=True)
-                first_chunk = False
-            
-            print(chunk, end="", flush=True)
-            if not chunk.startswith("\n\n\033[90m"):
-                full_response += chunk
-        
-        print("\n")
-        
-        # Save response to memory
-        memory.store("Beatrice", full_response)
-        
-        # Update session history
-        history.append({"role": "user", "content": user_input})
-        history.append({"role": "assistant", "content": full_response})
-        
-        # Keep only last 10 exchanges to avoid context overflow
-        if len(history) > 20:
-            history = history[-20:]
+            while True:
+                current["task"] = asyncio.ensure_future(read_input("\033[94mYou:\033[0m "))
+                try:
+                    user_input = await current["task"]
+                except (KeyboardInterrupt, EOFError, asyncio.CancelledError):
+                    print("\n\n\033[95mBeatrice:\033[0m Leaving so soon? How typical, I suppose...")
+                    break
+                    
+                if user_input.lower() in ['quit', 'exit', 'bye']:
+                    print("\n\033[95mBeatrice:\033[0m Fine, leave then. Not that I care, I suppose...")
+                    break
+                
+                if user_input.lower() == 'clear':
+                    writer.forget()
+                    history = []
+                    print("\033[93m✓ Memory cleared\033[0m\n")
+                    continue
+                
+                if not user_input.strip():
+                    continue
+                
+                decision = router.route(user_input)
+                if router.enabled:
+                    print(f"\033[90m→ {decision.model} ({decision.reason})\033[0m")
+                
+                current["task"] = asyncio.ensure_future(generate_reply(client, decision.model, user_input, history))
+                try:
+                    full_response, timings = await current["task"]
+                except asyncio.CancelledError:
+                    # Without our handler, Ctrl-C cancels main() itself: end the session
+                    if asyncio.current_task().cancelling():
+                        raise
+                    # A partial reply shouldn't be remembered, so drop the whole exchange
+                    print("\033[90m[interrupted]\033[0m\n")
+                    continue
+                
+                # Failed or empty replies are dropped the same way
+                if not full_response:
+                    continue
+                
+                if router.enabled:
+                    latency.record(decision.model, timings[1])
+                    writer.submit(log_route, decision, *timings)
+                
+                # Save the exchange to memory; the disk write happens in the background
+                writer.remember("User", user_input)
+                writer.remember("Beatrice", full_response)
+                
+                # Update session history
+                history.append({"role": "user", "content": user_input})
+                history.append({"role": "assistant", "content": full_response})
+                
+                # Keep only last 10 exchanges to avoid context overflow
+                if len(history) > 20:
+                    history = history[-20:]
+        finally:
+            if has_handler:
+                loop.remove_signal_handler(signal.SIGINT)
+            await writer.drain()
+            if router.enabled:
+                for line in latency.summary():
+                    print(f"\033[90m{line}\033[0m")
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
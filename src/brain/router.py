@@ -0,0 +1,133 @@
+"""
+Per-turn model routing for Beatrice.
+Sends short, casual turns to a small fast model and everything else to the
+larger model. The classifier is a handful of cheap string checks so routing
+never costs more than the latency it is trying to save.
+"""
+import json
+import os
+import re
+import statistics
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data")
+ROUTING_LOG = os.path.join(DATA_DIR, "routing.jsonl")
+
+# Keep only the most recent entries so the log can't grow without bound
+MAX_LOG_ENTRIES = 1000
+
+# Turns longer than this (in words) go to the large model
+MAX_FAST_WORDS = 20
+
+# Phrases that suggest the user wants a tool (time, files, commands)
+TOOL_HINTS = [
+    "what time", "time is it", "what day", "date today", "today's date",
+    "list files", "list the files", "directory", "folder", "execute", "command",
+]
+
+# Words that usually mean the turn needs reasoning rather than banter
+COMPLEX_HINTS = [
+    "explain", "why", "how do", "how does", "how can", "how to", "compare", "difference",
+    "analyze", "analyse", "summarize", "summarise", "translate", "step by step",
+    "plan", "code", "debug", "error", "write", "calculate", "prove",
+]
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _hint_pattern(hints: List[str]) -> "re.Pattern":
+    """Match any hint as whole words, so "plan" doesn't fire on "planet"."""
+    return re.compile(r"\b(?:" + "|".join(re.escape(h) for h in hints) + r")\b")
+
+
+_TOOL_RE = _hint_pattern(TOOL_HINTS)
+_COMPLEX_RE = _hint_pattern(COMPLEX_HINTS)
+
+
+@dataclass
+class RouteDecision:
+    """Which model a turn was sent to, and why."""
+    model: str
+    tier: str  # "fast" or "large"
+    reason: str
+
+
+class ModelRouter:
+    """Chooses between a fast and a large model for each turn."""
+
+    def __init__(self, large_model: str, fast_model: Optional[str] = None):
+        self.large_model = large_model
+        self.fast_model = fast_model
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.fast_model) and self.fast_model != self.large_model
+
+    def classify(self, user_input: str) -> str:
+        """Return why a turn needs the large model, or "" if the fast one will do."""
+        text = user_input.lower()
+
+        if len(_WORD_RE.findall(text)) > MAX_FAST_WORDS:
+            return "long"
+        if "\n" in user_input or "```" in user_input or text.count("?") > 1:
+            return "multi-part"
+        if _TOOL_RE.search(text):
+            return "tool"
+        if _COMPLEX_RE.search(text):
+            return "complex"
+        return ""
+
+    def route(self, user_input: str) -> RouteDecision:
+        """Pick the model for this turn."""
+        if not self.enabled:
+            return RouteDecision(self.large_model, "large", "single-model")
+
+        reason = self.classify(user_input)
+        if reason:
+            return RouteDecision(self.large_model, "large", reason)
+        return RouteDecision(self.fast_model, "fast", "simple")
+
+
+class LatencyTracker:
+    """Keeps per-model reply latencies for the session."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def record(self, model: str, seconds: float):
+        self.samples.setdefault(model, []).append(seconds)
+
+    def summary(self) -> List[str]:
+        """One line per model: turn count and median latency."""
+        lines = []
+        for model, samples in self.samples.items():
+            lines.append(f"{model}: {len(samples)} turns, median {statistics.median(samples):.2f}s")
+        return lines
+
+
+def log_route(decision: RouteDecision, first_output: float, total: float):
+    """Append one routing decision and its latencies to the routing log.
+    
+    first_output_s is time to first displayed output, not time-to-first-token:
+    chat.py buffers the first pass to detect tool calls, so for most turns it
+    equals total_s.
+    """
+    record = {
+        **asdict(decision),
+        "first_output_s": round(first_output, 3),
+        "total_s": round(total, 3),
+        "timestamp": datetime.now().isoformat(),
+    }
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        lines = []
+        if os.path.exists(ROUTING_LOG):
+            with open(ROUTING_LOG, 'r') as f:
+                lines = f.readlines()
+        lines.append(json.dumps(record) + "\n")
+        with open(ROUTING_LOG, 'w') as f:
+            f.writelines(lines[-MAX_LOG_ENTRIES:])
+    except IOError:
+        pass
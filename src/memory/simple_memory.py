@@ -4,6 +4,7 @@ No external dependencies required - uses just the standard library.
 """
 import json
 import os
+import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 
@@ -16,6 +17,10 @@ class SimpleMemory:
     
     def __init__(self):
         os.makedirs(DATA_DIR, exist_ok=True)
+        # Guards self.memories; flush() may run on a background thread
+        self._lock = threading.Lock()
+        # Serializes disk writes so an older snapshot never overwrites a newer one
+        self._write_lock = threading.Lock()
         self.memories: List[Dict] = self._load()
     
     def _load(self) -> List[Dict]:
@@ -30,34 +35,49 @@ class SimpleMemory:
     
     def _save(self):
         """Save memories to file."""
-        try:
-            with open(MEMORY_FILE, 'w') as f:
-                json.dump(self.memories, f, indent=2)
-        except IOError:
-            pass
+        with self._write_lock:
+            with self._lock:
+                snapshot = list(self.memories)
+            try:
+                with open(MEMORY_FILE, 'w') as f:
+                    json.dump(snapshot, f, indent=2)
+            except IOError:
+                pass
+    
+    def add(self, speaker: str, text: str):
+        """Add a conversation snippet in memory without writing to disk."""
+        with self._lock:
+            self.memories.append({
+                "speaker": speaker,
+                "text": text,
+                "timestamp": datetime.now().isoformat()
+            })
+            # Keep only last 100 memories to prevent file bloat
+            if len(self.memories) > 100:
+                self.memories = self.memories[-100:]
+    
+    def flush(self):
+        """Persist the current memories to disk. Safe to call from a worker thread."""
+        self._save()
     
     def store(self, speaker: str, text: str):
         """Store a conversation snippet."""
-        self.memories.append({
-            "speaker": speaker,
-            "text": text,
-            "timestamp": datetime.now().isoformat()
-        })
-        # Keep only last 100 memories to prevent file bloat
-        if len(self.memories) > 100:
-            self.memories = self.memories[-100:]
+        self.add(speaker, text)
         self._save()
     
     def get_recent(self, n: int = 10) -> List[Dict]:
         """Get the n most recent memories."""
-        return self.memories[-n:]
+        with self._lock:
+            return self.memories[-n:]
     
     def search(self, query: str, n: int = 5) -> List[str]:
         """Simple keyword search through memories."""
         query_lower = query.lower()
         matches = []
+        with self._lock:
+            memories = list(self.memories)
         
-        for mem in reversed(self.memories):
+        for mem in reversed(memories):
             text = mem.get("text", "")
             if any(word in text.lower() for word in query_lower.split()):
                 matches.append(f"{mem['speaker']}: {text}")
@@ -70,8 +90,10 @@ class SimpleMemory:
         """Extract key facts the user has shared (name, preferences, etc.)."""
         facts = []
         keywords = ["my name is", "i am ", "i'm ", "call me", "i like", "i love", "i hate"]
+        with self._lock:
+            memories = list(self.memories)
         
-        for mem in self.memories:
+        for mem in memories:
             if mem.get("speaker") == "User":
                 text_lower = mem["text"].lower()
                 for keyword in keywords:
@@ -81,7 +103,12 @@ class SimpleMemory:
         
         return facts[-5:]  # Return last 5 facts
     
+    def reset(self):
+        """Clear all memories in memory without writing to disk."""
+        with self._lock:
+            self.memories = []
+    
     def clear(self):
         """Clear all memories."""
-        self.memories = []
+        self.reset()
         self._save()
@@ -0,0 +1,59 @@
+"""
+Routing table for ModelRouter.classify.
+Run: python -m pytest tests/
+"""
+import os
+import sys
+
+import pytest
+
+# Add project root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.brain.router import ModelRouter
+
+CASES = [
+    # Long turns
+    (" ".join(["word"] * 21), "long"),
+    (" ".join(["word"] * 20), ""),
+    # Multi-part turns
+    ("first line\nsecond line", "multi-part"),
+    ("look at ```this```", "multi-part"),
+    ("are you there? are you sure?", "multi-part"),
+    # Tool intent
+    ("what time is it", "tool"),
+    ("list files in /tmp", "tool"),
+    ("what's today's date", "tool"),
+    # Complex turns
+    ("explain this", "complex"),
+    ("why?", "complex"),
+    ("how does a cpu cache work", "complex"),
+    ("can you write me a poem", "complex"),
+    # Simple turns
+    ("hello!", ""),
+    ("my name is Bob", ""),
+    ("ok lol", ""),
+    # Hints only match whole words
+    ("I love this planet", ""),
+    ("what is the codename", ""),
+    ("whyyy", ""),
+    ("we spent all the time", ""),
+    ("outrun them", ""),
+]
+
+
+@pytest.mark.parametrize("text,reason", CASES)
+def test_classify(text, reason):
+    assert ModelRouter("large", "fast").classify(text) == reason
+
+
+def test_route_uses_fast_model_for_simple_turns():
+    router = ModelRouter("large", "fast")
+    assert router.route("hello!").model == "fast"
+    assert router.route("explain this").model == "large"
+
+
+def test_route_without_fast_model_is_single_model():
+    router = ModelRouter("large")
+    assert not router.enabled
+    assert router.route("hello!").model == "large"